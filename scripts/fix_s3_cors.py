@@ -1,15 +1,7 @@
-import boto3
+from src.core.aws import s3_client
 from src.core.config import settings
 
 def fix_cors():
-    client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        aws_session_token=settings.AWS_SESSION_TOKEN,
-        region_name=settings.AWS_REGION
-    )
-
     cors_configuration = {
         'CORSRules': [
             {
@@ -24,7 +16,7 @@ def fix_cors():
 
     print(f"Applying CORS to bucket: {settings.S3_BUCKET}")
     try:
-        client.put_bucket_cors(
+        s3_client.put_bucket_cors(
             Bucket=settings.S3_BUCKET,
             CORSConfiguration=cors_configuration
         )
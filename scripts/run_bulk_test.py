@@ -1,8 +1,85 @@
 import os
+import gzip
 import httpx
+import orjson
 import asyncio
 import sys
 
+PART_CONCURRENCY = 8  # Parts in flight at once
+READ_AHEAD = 4  # Parts buffered between disk reads and uploads
+CHUNK_SIZE = 1024 * 1024  # 1MB body frames for streamed PUTs
+
+# One pooled client serves both the API and S3; HTTP/2 is negotiated over TLS
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+def read_part(fd: int, offset: int, size: int) -> bytes:
+    """Read one part at an absolute offset without relying on a shared seek pointer."""
+    if hasattr(os, "pread"):
+        return os.pread(fd, size, offset)
+    # Windows has no pread; safe here because a single producer issues the reads
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+async def read_parts(
+    file_path: str, file_size: int, part_size: int, queue: asyncio.Queue, worker_count: int
+) -> None:
+    """Producer: read parts in a worker thread and feed (part_number, chunk) tuples."""
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        for part_number, offset in enumerate(range(0, file_size, part_size), start=1):
+            # Disk reads run off the event loop so they overlap in-flight PUTs
+            chunk = await asyncio.to_thread(read_part, fd, offset, part_size)
+            await queue.put((part_number, chunk))
+    finally:
+        os.close(fd)
+
+    # One sentinel per worker so every consumer exits cleanly
+    for _ in range(worker_count):
+        await queue.put(None)
+
+
+async def chunker(path: str, size: int = CHUNK_SIZE):
+    """Yield the file in fixed-size chunks, reading each one in a worker thread."""
+    with open(path, 'rb') as f:
+        while chunk := await asyncio.to_thread(f.read, size):
+            yield chunk
+
+
+async def fetch_part_urls(
+    client: httpx.AsyncClient, base_url: str, upload_id: str, part_count: int
+) -> dict:
+    """Presign every part in one API call and return {part_number: url}."""
+    print(f"  Requesting URLs for {part_count} parts...")
+    res = await client.post(
+        f"{base_url}/{upload_id}/parts",
+        json={"part_numbers": list(range(1, part_count + 1))},
+    )
+    res.raise_for_status()
+    return {p["part_number"]: p["presigned_url"] for p in res.json()["parts"]}
+
+
+async def upload_parts(
+    client: httpx.AsyncClient,
+    part_urls: dict,
+    queue: asyncio.Queue,
+    parts: list,
+) -> None:
+    """Consumer: PUT parts until the producer signals completion."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        part_number, chunk = item
+
+        print(f"  Uploading Part {part_number}...")
+        s3_res = await client.put(part_urls[part_number], content=chunk)
+        s3_res.raise_for_status()
+        parts.append({"PartNumber": part_number, "ETag": s3_res.headers.get("ETag")})
+
+
 async def test_bulk_upload_real_file():
     file_path = r"C:\Users\petchiappan.p\Downloads\adventure.mp4"
     if not os.path.exists(file_path):
@@ -22,53 +99,55 @@ async def test_bulk_upload_real_file():
         "uploads": [{"filename": filename, "file_size": file_size, "content_type": content_type}]
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT) as client:
         print("Requesting upload initiation from API...")
         response = await client.post(api_url, json=payload)
         if response.status_code != 201:
             print(f"API Error: {response.status_code} - {response.text}")
             return
-        
+
         data = response.json()
         upload_info = data["results"][0]
         upload_id = upload_info["upload_id"]
         is_multipart = upload_info["is_multipart"]
-        
+
         if not is_multipart:
             print(f"Received Single-PUT URL for {filename}")
             presigned_url = upload_info["presigned_url"]
-            with open(file_path, "rb") as f:
-                s3_response = await client.put(presigned_url, content=f, headers={"Content-Type": content_type})
-            
+            # Memory stays at one chunk and every disk read runs in a worker thread.
+            # S3 presigned PUTs reject chunked bodies, so the length is sent explicitly.
+            headers = {"Content-Type": content_type, "Content-Length": str(file_size)}
+            s3_response = await client.put(presigned_url, content=chunker(file_path), headers=headers)
+
             if s3_response.status_code == 200:
                 print(f"SUCCESS: File uploaded to S3: {upload_info['object_key']}")
             else:
                 print(f"S3 Upload Failed: {s3_response.status_code} - {s3_response.text}")
         else:
             print(f"Multipart Upload Detected (ID: {upload_info['s3_upload_id']})")
-            part_size = 10 * 1024 * 1024  # 10MB parts
             parts = []
-            
-            with open(file_path, "rb") as f:
-                part_number = 1
-                while True:
-                    chunk = f.read(part_size)
-                    if not chunk:
-                        break
-                    
-                    print(f"  Requesting URL for Part {part_number}...")
-                    part_url_res = await client.get(f"{base_url}/{upload_id}/part/{part_number}")
-                    part_url = part_url_res.json()["presigned_url"]
-                    
-                    print(f"  Uploading Part {part_number}...")
-                    s3_res = await client.put(part_url, content=chunk)
-                    etag = s3_res.headers.get("ETag")
-                    parts.append({"PartNumber": part_number, "ETag": etag})
-                    
-                    part_number += 1
-            
+            part_size = upload_info["part_size"]  # Server picks the size for this file
+            part_count = -(-file_size // part_size)  # ceil division
+            part_urls = await fetch_part_urls(client, base_url, upload_id, part_count)
+
+            # Bounded queue caps buffered chunks; workers cap parts in flight
+            queue = asyncio.Queue(maxsize=READ_AHEAD)
+            workers = [
+                upload_parts(client, part_urls, queue, parts)
+                for _ in range(PART_CONCURRENCY)
+            ]
+            await asyncio.gather(read_parts(file_path, file_size, part_size, queue, PART_CONCURRENCY), *workers)
+
+            # Parts finish out of order; S3 requires ascending PartNumber
+            parts.sort(key=lambda p: p["PartNumber"])
+
             print(f"Completing Multipart Upload...")
-            complete_res = await client.post(f"{base_url}/{upload_id}/complete", json={"parts": parts})
+            # Part lists are repetitive JSON; the API inflates gzip request bodies
+            complete_res = await client.post(
+                f"{base_url}/{upload_id}/complete",
+                content=gzip.compress(orjson.dumps({"parts": parts}), compresslevel=5),
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
             if complete_res.status_code == 200:
                 print(f"SUCCESS: Multipart upload completed: {complete_res.json().get('location')}")
             else:
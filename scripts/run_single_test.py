@@ -1,4 +1,5 @@
-import requests
+import httpx
+import asyncio
 import os
 import sys
 
@@ -6,7 +7,18 @@ import sys
 BASE_URL = "http://127.0.0.1:8000/api/v1"
 FILE_PATH = r"C:\Users\petchiappan.p\Downloads\sample-4.mp4"
 
-def test_upload():
+# One pooled client serves both the API and S3; HTTP/2 is negotiated over TLS
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+CHUNK_SIZE = 1024 * 1024  # 1MB body frames
+
+async def chunker(path: str, size: int = CHUNK_SIZE):
+    """Yield the file in fixed-size chunks, reading each one in a worker thread."""
+    with open(path, 'rb') as f:
+        while chunk := await asyncio.to_thread(f.read, size):
+            yield chunk
+
+async def test_upload():
     if not os.path.exists(FILE_PATH):
         print(f"Error: File not found at {FILE_PATH}")
         return
@@ -24,31 +36,33 @@ def test_upload():
         "content_type": "video/mp4"
     }
     
-    try:
-        response = requests.post(f"{BASE_URL}/upload", json=payload)
-        response.raise_for_status()
-        data = response.json()
-        
-        presigned_url = data["presigned_url"]
-        upload_id = data["upload_id"]
-        print(f"Success! Upload ID: {upload_id}")
-        
-        # Step 2: Upload to S3
-        print("Uploading file to S3 via presigned URL...")
-        with open(FILE_PATH, 'rb') as f:
-            upload_response = requests.put(
+    async with httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT) as client:
+        try:
+            response = await client.post(f"{BASE_URL}/upload", json=payload)
+            response.raise_for_status()
+            data = response.json()
+            
+            presigned_url = data["presigned_url"]
+            upload_id = data["upload_id"]
+            print(f"Success! Upload ID: {upload_id}")
+            
+            # Step 2: Upload to S3
+            print("Uploading file to S3 via presigned URL...")
+            # Memory stays at one chunk regardless of file size. S3 presigned
+            # PUTs reject chunked bodies, so the length is sent explicitly.
+            upload_response = await client.put(
                 presigned_url, 
-                data=f, 
-                headers={'Content-Type': 'video/mp4'}
+                content=chunker(FILE_PATH), 
+                headers={'Content-Type': 'video/mp4', 'Content-Length': str(file_size)}
             )
             upload_response.raise_for_status()
+                
+            print(" SUCCESS: File uploaded successfully to S3!")
             
-        print(" SUCCESS: File uploaded successfully to S3!")
-        
-    except Exception as e:
-        print(f" FAILED: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Detail: {e.response.text}")
+        except Exception as e:
+            print(f" FAILED: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                print(f"Detail: {e.response.text}")
 
 if __name__ == "__main__":
-    test_upload()
+    asyncio.run(test_upload())
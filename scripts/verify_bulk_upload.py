@@ -1,38 +1,56 @@
-import requests
-import json
+import asyncio
+import sys
+import httpx
+import orjson
 
 BASE_URL = "http://127.0.0.1:8000/api/v1"
 
-def test_bulk_upload():
-    payload = {
-        "uploads": [
-            {
-                "filename": "test_video1.mp4",
-                "file_size": 1024 * 1024,  # 1 MB
-                "content_type": "video/mp4"
-            },
-            {
-                "filename": "large_video2.mkv",
-                "file_size": 1024 * 1024 * 500, # 500 MB (Multipart)
-                "content_type": "video/x-matroska"
-            }
-        ]
-    }
-    
-    print(f"Sending bulk upload request to {BASE_URL}/bulk-upload...")
-    response = requests.post(f"{BASE_URL}/bulk-upload", json=payload)
-    
+# Same pooled HTTP/2 client settings as the other upload scripts
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Serialized once and shared by every concurrent run
+BULK_PAYLOAD = orjson.dumps({
+    "uploads": [
+        {
+            "filename": "test_video1.mp4",
+            "file_size": 1024 * 1024,  # 1 MB
+            "content_type": "video/mp4"
+        },
+        {
+            "filename": "large_video2.mkv",
+            "file_size": 1024 * 1024 * 500, # 500 MB (Multipart)
+            "content_type": "video/x-matroska"
+        }
+    ]
+})
+
+async def test_bulk_upload(client: httpx.AsyncClient, run: int) -> bool:
+    print(f"[{run}] Sending bulk upload request to {BASE_URL}/bulk-upload...")
+    response = await client.post(
+        f"{BASE_URL}/bulk-upload", content=BULK_PAYLOAD, headers={"Content-Type": "application/json"}
+    )
+
     if response.status_code == 201:
-        print(" Bulk upload initiation successful!")
+        print(f"[{run}] Bulk upload initiation successful!")
         results = response.json().get("results", [])
         for i, res in enumerate(results):
-            print(f"\nFile {i+1}:")
+            print(f"\n[{run}] File {i+1}:")
             print(f"  Upload ID: {res['upload_id']}")
             print(f"  Object Key: {res['object_key']}")
-            print(f"  Presigned URL/ID: {res['presigned_url'][:50]}...")
-    else:
-        print(f" Failed! Status Code: {response.status_code}")
-        print(response.text)
+            print(f"  Presigned URL/ID: {(res.get('presigned_url') or res.get('s3_upload_id'))[:50]}...")
+        return True
+
+    print(f"[{run}] Failed! Status Code: {response.status_code}")
+    print(response.text)
+    return False
+
+async def main(runs: int) -> None:
+    # Concurrent runs share one connection pool and double as a light load test
+    async with httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT) as client:
+        outcomes = await asyncio.gather(*(test_bulk_upload(client, run) for run in range(1, runs + 1)))
+    print(f"\n{sum(outcomes)}/{runs} bulk upload runs succeeded")
 
 if __name__ == "__main__":
-    test_bulk_upload()
+    # Usage: python scripts/verify_bulk_upload.py [concurrent_runs]
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
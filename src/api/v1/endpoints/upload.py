@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.upload_schema import (
     UploadRequest, UploadResponse, BulkUploadRequest, BulkUploadResponse,
-    MultipartPartResponse, MultipartCompleteRequest
+    MultipartPartResponse, MultipartPartsRequest, MultipartPartsResponse,
+    MultipartCompleteRequest, MultipartCompleteResponse
 )
 from src.services.upload_service import UploadService
 from src.repositories.upload_repository import UploadRepository
@@ -12,11 +13,16 @@ import uuid
 
 router = APIRouter()
 
-def _get_upload_service(db: Session = Depends(get_db)) -> UploadService:
+def _get_upload_service(db: AsyncSession = Depends(get_db)) -> UploadService:
     """Rule 4: Dependency injection for UploadService."""
+    # Runs on every request; both classes use __slots__ to keep this construction cheap
     return UploadService(repository=UploadRepository(db))
 
-@router.post("/bulk-upload", response_model=BulkUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/bulk-upload",
+    response_model=BulkUploadResponse,
+    status_code=status.HTTP_201_CREATED
+)
 async def create_bulk_upload(
     request: BulkUploadRequest,
     service: UploadService = Depends(_get_upload_service)
@@ -49,7 +55,7 @@ async def create_bulk_upload(
 @router.get("/{upload_id}/part/{part_number}", response_model=MultipartPartResponse)
 async def get_multipart_part_url(
     upload_id: uuid.UUID,
-    part_number: int,
+    part_number: int = Path(..., ge=1, le=10000),
     service: UploadService = Depends(_get_upload_service)
 ):
     """
@@ -71,7 +77,32 @@ async def get_multipart_part_url(
         logger.error(f"Error in part URL endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-@router.post("/{upload_id}/complete", status_code=status.HTTP_200_OK)
+@router.post("/{upload_id}/parts", response_model=MultipartPartsResponse)
+async def get_multipart_part_urls(
+    upload_id: uuid.UUID,
+    request: MultipartPartsRequest,
+    service: UploadService = Depends(_get_upload_service)
+):
+    """
+    Generate presigned URLs for several parts of a multipart upload at once.
+    
+    Args:
+        upload_id: The unique identifier of the initiated upload.
+        request: MultipartPartsRequest containing the part numbers to presign.
+        service: Injected UploadService.
+        
+    Returns:
+        MultipartPartsResponse containing one presigned URL per requested part.
+    """
+    try:
+        return await service.get_multipart_part_urls(upload_id, request.part_numbers)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch part URL endpoint: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.post("/{upload_id}/complete", response_model=MultipartCompleteResponse, status_code=status.HTTP_200_OK)
 async def complete_multipart_upload_endpoint(
     upload_id: uuid.UUID,
     request: MultipartCompleteRequest,
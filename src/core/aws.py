@@ -0,0 +1,122 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional
+import boto3
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
+from src.core.config import settings
+from src.core.logging import logger
+
+def _build_session(
+    access_key_id: Optional[str],
+    secret_access_key: Optional[str],
+    session_token: Optional[str] = None
+) -> boto3.Session:
+    """
+    Build a boto3 session from explicit keys, or from the default provider chain.
+    
+    Without explicit keys the default chain is used. For roles, SSO and instance
+    profiles it yields RefreshableCredentials, so tokens renew automatically.
+    
+    Args:
+        access_key_id: Optional explicit access key.
+        secret_access_key: Optional explicit secret key.
+        session_token: Optional STS session token for temporary keys.
+        
+    Returns:
+        A boto3 Session bound to the configured region.
+    """
+    # DEBUG: Help identify if stale creds are being used
+    if logger.isEnabledFor(logging.DEBUG):
+        ak_hint = access_key_id[:5] if access_key_id else "NONE"
+        st_len = len(session_token) if session_token else 0
+        logger.debug(f"AWS Session Init - AK: {ak_hint}..., Token Len: {st_len}")
+
+    if access_key_id and secret_access_key:
+        return boto3.Session(
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            aws_session_token=session_token,
+            region_name=settings.AWS_REGION
+        )
+    return boto3.Session(region_name=settings.AWS_REGION)
+
+def _build_s3_client(session: boto3.Session):
+    """
+    Build an S3 client for the given session.
+    
+    Client construction loads the service model and endpoint resolver, so it is
+    done once at import. boto3 clients are thread-safe and can be shared.
+    
+    Returns:
+        A configured botocore S3 client.
+    """
+    config = Config(
+        signature_version='s3v4',
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        retries={'mode': 'adaptive', 'max_attempts': 3},
+        tcp_keepalive=True
+    )
+    return session.client('s3', config=config)
+
+session = _build_session(
+    settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY, settings.AWS_SESSION_TOKEN
+)
+s3_client = _build_s3_client(session)
+
+# Long-lived signing keys let presigned URLs outlive short STS sessions
+if settings.S3_PRESIGN_ACCESS_KEY_ID and settings.S3_PRESIGN_SECRET_ACCESS_KEY:
+    presign_session = _build_session(
+        settings.S3_PRESIGN_ACCESS_KEY_ID, settings.S3_PRESIGN_SECRET_ACCESS_KEY
+    )
+    presign_client = _build_s3_client(presign_session)
+else:
+    presign_session, presign_client = session, s3_client
+
+PRESIGN_POOL_WORKERS = settings.PRESIGN_POOL_WORKERS or os.cpu_count() or 1
+
+@lru_cache(maxsize=1)
+def get_presign_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool used to sign large bulk batches, creating it on first use.
+    
+    SigV4 signing holds the GIL, so threads cannot run it in parallel. Workers are
+    spawned, not forked: the parent already runs logging and executor threads.
+    Each worker imports this module and builds its own process-local client.
+    """
+    return ProcessPoolExecutor(
+        max_workers=PRESIGN_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+def shutdown_presign_pool() -> None:
+    """Stop the presign pool if it was ever started."""
+    if get_presign_pool.cache_info().currsize:
+        get_presign_pool().shutdown(cancel_futures=True)
+        get_presign_pool.cache_clear()
+
+def presign_credentials_cover(seconds: int) -> bool:
+    """
+    Check whether the signing credentials stay valid for a URL lifetime.
+    
+    A presigned URL stops working when the credentials that signed it expire,
+    so its real lifetime is min(ExpiresIn, remaining credential TTL). Static
+    keys carry no expiry and always pass. Refreshable credentials may be renewed
+    synchronously here, so call this off the event loop.
+    
+    Args:
+        seconds: The intended presigned URL lifetime.
+        
+    Returns:
+        True if the credentials outlive the URL, else False.
+    """
+    credentials = presign_session.get_credentials()
+    if not isinstance(credentials, RefreshableCredentials):
+        return True
+    # Gives botocore the chance to renew inside its refresh window before signing
+    credentials.get_frozen_credentials()
+    return not credentials.refresh_needed(refresh_in=seconds)
@@ -1,15 +1,27 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, List
 
+# The engine is async-only; plain URLs are pointed at the matching async driver
+_ASYNC_DRIVER_SCHEMES = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+}
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Mediacorp Backend"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    ENV: str = "dev"  # dev creates tables on startup; other envs rely on Alembic
     
     SECRET_KEY: str = "secret"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    DATABASE_URL: Optional[str] = "sqlite:///./app.db"
+    DATABASE_URL: Optional[str] = "sqlite+aiosqlite:///./app.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # seconds
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -21,13 +33,30 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_SESSION_TOKEN: Optional[str] = None
     KMS_KEY_ID: Optional[str] = None
+    S3_MAX_POOL_CONNECTIONS: int = 50  # Sized for concurrent presign/upload calls
+    S3_BULK_CONCURRENCY: int = 16  # Multipart initiations in flight per bulk request
+    # Optional long-lived keys used only for presigning (URLs outlive STS tokens)
+    S3_PRESIGN_ACCESS_KEY_ID: Optional[str] = None
+    S3_PRESIGN_SECRET_ACCESS_KEY: Optional[str] = None
     
     # Upload Configuration
     PRESIGNED_URL_EXPIRY: int = 3600  # 1 hour
+    # Bulk requests with at least this many single-PUT files sign across a process pool
+    PRESIGN_POOL_MIN_BATCH: int = 256
+    PRESIGN_POOL_WORKERS: Optional[int] = None  # Defaults to the CPU count
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024 * 1024  # 10 GB
     
     ALLOWED_ORIGINS: List[str] = ["*"]
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @field_validator("DATABASE_URL")
+    @classmethod
+    def use_async_driver(cls, url: Optional[str]) -> Optional[str]:
+        """Rewrite sync sqlite:// and postgresql:// URLs (e.g. older .env files) to async drivers."""
+        for scheme, async_scheme in _ASYNC_DRIVER_SCHEMES.items():
+            if url and url.startswith(scheme):
+                return async_scheme + url[len(scheme):]
+        return url
+
 settings = Settings()
@@ -1,25 +1,32 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 from src.core.config import settings
 
-# Rule 9: SQLAlchemy setup
+# Rule 9: SQLAlchemy setup (async drivers: asyncpg for PostgreSQL, aiosqlite for SQLite)
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+_is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
 
 # For SQLite, we need to allow access from multiple threads
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
+connect_args = {"check_same_thread": False} if _is_sqlite else {}
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args, pool_pre_ping=True
+# Size the pool for concurrent requests; SQLite is single-writer, so keep its default
+pool_args = {} if _is_sqlite else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+}
+
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args=connect_args, pool_pre_ping=True, **pool_args
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: attribute access after commit would otherwise trigger
+# implicit IO, which AsyncSession does not allow
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
-def get_db():
+async def get_db():
     """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,24 +1,63 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Any
 
+import orjson
+
+from src.core.config import settings
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        # Format: Timestamp, Level, Module, Function, Line Number, Message
+        payload: dict[str, Any] = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload).decode()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records untouched so all formatting happens on the listener thread.
+    
+    The stock prepare() formats on the calling thread and folds the traceback
+    into msg, which also hides exc_info from JsonFormatter. The queue never
+    leaves this process, so the record does not need to be made picklable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 # Rule 11: Centralized logger setup
 def setup_logging() -> logging.Logger:
     """Setup centralized logger for the application."""
     logger = logging.getLogger("app")
-    logger.setLevel(logging.INFO)
-
-    # Format: Timestamp, Level, Module, Function, Line Number, Message
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(name)s.%(funcName)s:%(lineno)d - %(message)s"
-    )
+    # Level names are case-insensitive in .env; an unknown name fails at startup
+    logger.setLevel(settings.LOG_LEVEL.upper())
 
-    # Stream Handler (stdout)
-    stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    
     if not logger.handlers:
-        logger.addHandler(stream_handler)
+        # Stream Handler (stdout), driven from a background listener thread
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+
+        # Request handlers only enqueue records; formatting and the locked
+        # stdout write happen off the event loop
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(DeferredQueueHandler(log_queue))
     
     return logger
 
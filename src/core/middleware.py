@@ -0,0 +1,72 @@
+import zlib
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Ceiling on a decompressed request body; guards against gzip bombs
+MAX_DECOMPRESSED_BODY = 10 * 1024 * 1024  # 10 MB
+
+
+class GZipRequestMiddleware:
+    """
+    Decompress request bodies sent with `Content-Encoding: gzip`.
+    Starlette's GZipMiddleware only compresses responses; this covers the other
+    direction so clients can gzip large JSON payloads (e.g. /complete part lists).
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = MAX_DECOMPRESSED_BODY) -> None:
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _is_gzipped(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            body = await self._inflate(receive)
+        except (zlib.error, ValueError) as e:
+            response = PlainTextResponse(f"Invalid gzip request body: {e}", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        # Drop the encoding header and fix the length for downstream handlers
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = {**scope, "headers": headers}
+
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
+
+    async def _inflate(self, receive: Receive) -> bytes:
+        """Stream-decompress the body, refusing anything over max_size."""
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        out = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+            out += decoder.decompress(message.get("body", b""), self.max_size + 1 - len(out))
+            if len(out) > self.max_size or decoder.unconsumed_tail:
+                raise ValueError(f"decompressed body exceeds {self.max_size} bytes")
+        out += decoder.flush()
+        if len(out) > self.max_size:
+            raise ValueError(f"decompressed body exceeds {self.max_size} bytes")
+        if not decoder.eof:
+            raise ValueError("truncated gzip stream")
+        return bytes(out)
+
+
+def _is_gzipped(scope: Scope) -> bool:
+    """Return True when the request declares a gzip-encoded body."""
+    for key, value in scope["headers"]:
+        if key == b"content-encoding":
+            return value.strip().lower() == b"gzip"
+    return False
@@ -1,26 +1,37 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from src.api.v1.routes import v1_router
 from src.core.config import settings
+from src.core.aws import shutdown_presign_pool
 from src.core.database import Base, engine
 from src.core.logging import logger
+from src.core.middleware import GZipRequestMiddleware
+from src.services.s3_service import warm_up_presigner
+
+# Settings echoed (as short hints) at startup to verify the AWS session in use
+_AWS_ATTRS = (
+    "AWS_REGION", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY",
+    "AWS_SESSION_TOKEN", "KMS_KEY_ID", "S3_BUCKET",
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manage the lifecycle of the FastAPI application.
-    - On startup: Initializes database tables and logs AWS configuration hints.
+    - On startup: Logs AWS configuration hints and, in dev, creates database tables.
     - On shutdown: Performs clean shutdown logging.
     """
-    # Rule 9: Create tables in dev (In prod use Alembic)
     logger.info("Starting up Mediacorp Backend...")
     logger.info(f"S3 Bucket: {settings.S3_BUCKET}")
     logger.info(f"AWS Region: {settings.AWS_REGION}")
     
-    logger.info("Dumping AWS Settings for verification:")
-    for attr in dir(settings):
-        if "AWS" in attr and not attr.startswith("_"):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.info("Dumping AWS Settings for verification:")
+        for attr in _AWS_ATTRS:
             val = getattr(settings, attr)
             if val:
                 hint = str(val)[:5] + "..." if isinstance(val, str) else val
@@ -28,10 +39,20 @@ async def lifespan(app: FastAPI):
             else:
                 logger.info(f"  {attr}: NONE")
                 
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Rule 9: Create tables in dev (In prod use Alembic)
+    if settings.ENV == "dev":
+        logger.info("Creating database tables...")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Pay the first-sign cost (resolver, model, signer) before serving traffic
+    try:
+        await asyncio.to_thread(warm_up_presigner)
+    except Exception as e:
+        logger.warning(f"Presigner warm-up failed; first request will be slower: {e}")
     yield
     logger.info("Shutting down...")
+    shutdown_presign_pool()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -48,6 +69,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Presigned URL batches are highly repetitive JSON; compress both directions
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+app.add_middleware(GZipRequestMiddleware)
 
 # Rule 7: Versioned prefix
 app.include_router(v1_router, prefix=settings.API_V1_STR)
@@ -61,3 +85,8 @@ async def health_check():
 async def root():
     """Root endpoint providing a welcome message."""
     return {"message": "Welcome to Mediacorp Backend API"}
+
+if __name__ == "__main__":
+    import uvicorn
+    # "auto" selects uvloop and httptools when installed (uvicorn[standard], non-Windows)
+    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, loop="auto", http="auto")
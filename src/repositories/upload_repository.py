@@ -1,15 +1,18 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.upload_model import ContentInventory, ComponentStatus
 from src.core.logging import logger
-from typing import List, Optional
+from typing import Iterable, List, Optional
 import uuid
 
 class UploadRepository:
     """Rule 3.3: Pure database operations for Upload."""
-    def __init__(self, db: Session):
+    __slots__ = ("db",)
+
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_content_record(self, **kwargs) -> ContentInventory:
+    async def create_content_record(self, **kwargs) -> ContentInventory:
         """
         Create a new entry in the content_inventory table.
         
@@ -17,7 +20,7 @@ class UploadRepository:
             **kwargs: Column values for the ContentInventory model.
             
         Returns:
-            The created ContentInventory ORM object.
+            The created ContentInventory ORM object (server-default columns are not loaded).
             
         Raises:
             Exception: If the database insertion fails.
@@ -25,15 +28,110 @@ class UploadRepository:
         try:
             db_item = ContentInventory(**kwargs)
             self.db.add(db_item)
-            self.db.commit()
-            self.db.refresh(db_item)
+            await self.db.commit()
             return db_item
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Failed to create content record: {e}", exc_info=True)
             raise
 
-    def get_content_by_id(self, content_id: uuid.UUID) -> Optional[ContentInventory]:
+    async def create_content_with_components(
+        self, content_row: dict, components: Iterable[str]
+    ) -> ContentInventory:
+        """
+        Create a content record and its pending component statuses in one commit.
+        
+        Args:
+            content_row: Column values for the ContentInventory model.
+            components: Names of the processing components to initialise.
+            
+        Returns:
+            The created ContentInventory ORM object.
+            
+        Raises:
+            Exception: If the database insertion fails.
+        """
+        db_item = await self.stage_content_with_components(content_row, components)
+        await self.commit()
+        return db_item
+
+    async def stage_content_with_components(
+        self, content_row: dict, components: Iterable[str]
+    ) -> ContentInventory:
+        """
+        Insert a content record and its pending component statuses without committing.
+        
+        The rows are flushed inside the open transaction; the caller finishes it
+        with commit() or rollback().
+        
+        Args:
+            content_row: Column values for the ContentInventory model.
+            components: Names of the processing components to initialise.
+            
+        Returns:
+            The staged ContentInventory ORM object.
+            
+        Raises:
+            Exception: If the database insertion fails.
+        """
+        try:
+            db_item = ContentInventory(**content_row)
+            self.db.add(db_item)
+            # Flush the parent row first; the children then go in one executemany INSERT
+            await self.db.flush()
+            await self.db.execute(insert(ComponentStatus), [
+                {"content_id": db_item.content_id, "component": component, "status": "pending"}
+                for component in components
+            ])
+            return db_item
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to create content record with components: {e}", exc_info=True)
+            raise
+
+    async def commit(self) -> None:
+        """
+        Commit the current transaction.
+        
+        Raises:
+            Exception: If the commit fails; the transaction is rolled back.
+        """
+        try:
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to commit transaction: {e}", exc_info=True)
+            raise
+
+    async def rollback(self) -> None:
+        """Discard everything staged in the current transaction."""
+        await self.db.rollback()
+
+    async def bulk_create_content_records(self, content_rows: List[dict], component_rows: List[dict]) -> None:
+        """
+        Insert many content records and their component statuses in one transaction.
+        
+        Args:
+            content_rows: Column values for each ContentInventory row.
+            component_rows: Column values for each ComponentStatus row.
+            
+        Raises:
+            Exception: If the database insertion fails.
+        """
+        if not content_rows:
+            return
+        try:
+            # A list of parameter dicts runs as executemany; SQLAlchemy batches it into
+            # multi-row INSERTs (insertmanyvalues) instead of one statement per row
+            await self.db.execute(insert(ContentInventory), content_rows)
+            await self.db.execute(insert(ComponentStatus), component_rows)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to bulk create {len(content_rows)} content records: {e}", exc_info=True)
+            raise
+
+    async def get_content_by_id(self, content_id: uuid.UUID) -> Optional[ContentInventory]:
         """
         Retrieve a content record by its unique UUID.
         
@@ -43,9 +141,12 @@ class UploadRepository:
         Returns:
             ContentInventory object if found, else None.
         """
-        return self.db.query(ContentInventory).filter(ContentInventory.content_id == content_id).first()
+        result = await self.db.execute(
+            select(ContentInventory).where(ContentInventory.content_id == content_id)
+        )
+        return result.scalars().first()
 
-    def create_component_status(self, content_id: uuid.UUID, component: str, status: str = "pending") -> ComponentStatus:
+    async def create_component_status(self, content_id: uuid.UUID, component: str, status: str = "pending") -> ComponentStatus:
         """
         Initialize the processing state for a specific backend component.
         
@@ -55,7 +156,7 @@ class UploadRepository:
             status: Initial status string.
             
         Returns:
-            The created ComponentStatus ORM object.
+            The created ComponentStatus ORM object (server-default columns are not loaded).
         """
         try:
             db_item = ComponentStatus(
@@ -64,28 +165,37 @@ class UploadRepository:
                 status=status
             )
             self.db.add(db_item)
-            self.db.commit()
-            self.db.refresh(db_item)
+            await self.db.commit()
             return db_item
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Failed to create component status for {component}: {e}", exc_info=True)
             raise
 
-    def update_status(self, content_id: uuid.UUID, status: str):
+    async def update_status(self, content_id: uuid.UUID, status: str) -> Optional[ContentInventory]:
         """
         Atomically update the overall ingestion status of a content record.
         
+        Issues a single UPDATE ... RETURNING instead of SELECT, commit and refresh.
+        
         Args:
             content_id: UUID of the media content.
             status: New status string (e.g., 'uploaded').
             
         Returns:
-            The updated ContentInventory object.
+            The updated ContentInventory object, or None if no record matched.
         """
-        db_item = self.get_content_by_id(content_id)
-        if db_item:
-            db_item.status = status
-            self.db.commit()
-            self.db.refresh(db_item)
-        return db_item
+        try:
+            result = await self.db.execute(
+                update(ContentInventory)
+                .where(ContentInventory.content_id == content_id)
+                .values(status=status)
+                .returning(ContentInventory)
+            )
+            db_item = result.scalars().first()
+            await self.db.commit()
+            return db_item
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to update status for {content_id}: {e}", exc_info=True)
+            raise
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional, Dict, Any
+from typing import Annotated, Optional, Dict, Any
 from uuid import UUID
 
 class UploadRequest(BaseModel):
@@ -16,6 +16,7 @@ class UploadResponse(BaseModel):
     is_multipart: bool = False
     presigned_url: Optional[str] = None  # Valid if is_multipart is False
     s3_upload_id: Optional[str] = None   # Valid if is_multipart is True (S3's UploadId)
+    part_size: Optional[int] = None      # Valid if is_multipart is True (bytes per part)
     expires_in: int = 3600
 
     model_config = ConfigDict(from_attributes=True)
@@ -34,6 +35,17 @@ class MultipartPartResponse(BaseModel):
     part_number: int
     presigned_url: str
 
+class MultipartPartsRequest(BaseModel):
+    """Schema for requesting presigned URLs for several parts at once."""
+    part_numbers: list[Annotated[int, Field(ge=1, le=10000)]] = Field(
+        ..., min_length=1, max_length=10000, description="Part numbers (1-10000) to presign"
+    )
+
+class MultipartPartsResponse(BaseModel):
+    """Schema for a batch of part presigned URLs."""
+    upload_id: str
+    parts: list[MultipartPartResponse]
+
 class MultipartCompletePart(BaseModel):
     """Schema for a part's completion data (ETag)."""
     PartNumber: int
@@ -42,3 +54,9 @@ class MultipartCompletePart(BaseModel):
 class MultipartCompleteRequest(BaseModel):
     """Schema for completing a multipart upload."""
     parts: list[MultipartCompletePart]
+
+class MultipartCompleteResponse(BaseModel):
+    """Schema for a completed multipart upload."""
+    status: str
+    detail: Optional[str] = None
+    location: Optional[str] = None
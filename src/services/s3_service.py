@@ -1,30 +1,88 @@
-import boto3
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from urllib.parse import quote
 from botocore.exceptions import ClientError
-from botocore.config import Config
+from src.core.aws import (
+    s3_client, presign_client, presign_session, presign_credentials_cover,
+    get_presign_pool, shutdown_presign_pool, PRESIGN_POOL_WORKERS
+)
 from src.core.config import settings
 from src.core.logging import logger
 from typing import Optional
 
+# Rule: Only add KMS if configured (for dev simplicity). Settings are fixed for
+# the process, so the SSE parameters are resolved once at import.
+_SSE_PARAMS = (
+    {'ServerSideEncryption': 'aws:kms', 'SSEKMSKeyId': settings.KMS_KEY_ID}
+    if settings.KMS_KEY_ID else {}
+)
+
 def get_s3_client():
-    """Dynamically get S3 client using current settings."""
-    config = Config(
-        signature_version='s3v4',
-        region_name=settings.AWS_REGION
-    )
-    kwargs = {"region_name": settings.AWS_REGION, "config": config}
+    """Return the shared S3 client built once in src.core.aws."""
+    return s3_client
+
+def get_presign_client():
+    """Return the client used to sign URLs (dedicated signing keys if configured)."""
+    return presign_client
+
+def _check_presign_lifetime(expiration: int) -> None:
+    """
+    Warn when the signing credentials will expire before the URL does.
     
-    # DEBUG: Help identify if stale creds are being used
-    ak_hint = settings.AWS_ACCESS_KEY_ID[:5] if settings.AWS_ACCESS_KEY_ID else "NONE"
-    st_len = len(settings.AWS_SESSION_TOKEN) if settings.AWS_SESSION_TOKEN else 0
-    logger.debug(f"S3 Client Init - AK: {ak_hint}..., Token Len: {st_len}")
-
-    if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-        kwargs.update({
-            "aws_access_key_id": settings.AWS_ACCESS_KEY_ID,
-            "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY,
-            "aws_session_token": settings.AWS_SESSION_TOKEN
-        })
-    return boto3.client('s3', **kwargs)
+    May refresh credentials over the network (STS/IMDS/SSO), so it must only run
+    inside the signing thread or pool worker, never on the event loop.
+    """
+    if not presign_credentials_cover(expiration):
+        _warn_short_credentials(presign_session.get_credentials().get_frozen_credentials().access_key, expiration)
+
+@lru_cache(maxsize=1)
+def _warn_short_credentials(access_key: str, expiration: int) -> None:
+    """Log the short-lifetime warning once per set of credentials, not once per URL."""
+    logger.warning(
+        f"Signing credentials expire within {expiration}s; presigned URLs will stop "
+        f"working early. Set S3_PRESIGN_ACCESS_KEY_ID for long-lived signing keys."
+    )
+
+def warm_up_presigner() -> None:
+    """
+    Sign a throwaway URL so the endpoint resolver, service model and SigV4 signer
+    load at startup instead of on the first real request. Signing is local-only;
+    no request is sent to S3.
+    """
+    for client in {id(c): c for c in (get_presign_client(), get_s3_client())}.values():
+        client.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': settings.S3_BUCKET, 'Key': '_warmup'},
+            ExpiresIn=60
+        )
+    logger.info("S3 presigner warmed up")
+
+def build_object_url(bucket: str, object_key: str) -> str:
+    """
+    Build the virtual-hosted S3 URL of an object without going through botocore.
+    The URL is unsigned, so it is only readable for public objects or callers with
+    their own credentials.
+    """
+    return f"https://{bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{quote(object_key, safe='/~')}"
+
+def _object_params(bucket: str, object_key: str, content_type: str) -> dict:
+    """Build put_object / create_multipart_upload parameters for a new object."""
+    return {'Bucket': bucket, 'Key': object_key, 'ContentType': content_type, **_SSE_PARAMS}
+
+def _sign_put_urls(bucket: str, items: list[tuple[str, str]], expiration: int) -> list[str]:
+    """Sign single-PUT URLs for (object_key, content_type) pairs; runs in a thread or pool worker."""
+    _check_presign_lifetime(expiration)
+    client = get_presign_client()
+    return [
+        client.generate_presigned_url(
+            'put_object',
+            Params=_object_params(bucket, object_key, content_type),
+            ExpiresIn=expiration,
+            HttpMethod='PUT'
+        )
+        for object_key, content_type in items
+    ]
 
 async def generate_presigned_url(
     bucket: str,
@@ -37,24 +95,9 @@ async def generate_presigned_url(
     try:
         # 100MB threshold (Rule 3.2)
         if file_size < 100 * 1024 * 1024:
-            # Single PUT upload
-            params = {
-                'Bucket': bucket,
-                'Key': object_key,
-                'ContentType': content_type,
-            }
-            # Rule: Only add KMS if configured (for dev simplicity)
-            if settings.KMS_KEY_ID:
-                params['ServerSideEncryption'] = 'aws:kms'
-                params['SSEKMSKeyId'] = settings.KMS_KEY_ID
-                
-            client = get_s3_client()
-            url = client.generate_presigned_url(
-                'put_object',
-                Params=params,
-                ExpiresIn=expiration,
-                HttpMethod='PUT'
-            )
+            # Single PUT upload. Signing is CPU-bound and may refresh credentials;
+            # run it in a thread so the event loop stays free
+            [url] = await asyncio.to_thread(_sign_put_urls, bucket, [(object_key, content_type)], expiration)
             logger.info(f"Generated single-put presigned URL for {object_key}")
             return url
         else:
@@ -66,21 +109,56 @@ async def generate_presigned_url(
         logger.error(f"Error generating presigned URL for {object_key}: {e}", exc_info=True)
         raise
 
+async def generate_presigned_put_urls(
+    bucket: str,
+    items: list[tuple[str, str]],
+    expiration: int = 3600
+) -> list[str]:
+    """
+    Sign single-PUT URLs for many (object_key, content_type) pairs, in order.
+    
+    Small batches are signed in one worker thread. Batches of at least
+    PRESIGN_POOL_MIN_BATCH are split across the process pool so signing runs on
+    every core instead of serialising on the GIL. If a pool worker has died, the
+    broken pool is discarded and the batch is signed in a thread instead.
+    """
+    if not items:
+        return []
+    try:
+        if len(items) >= settings.PRESIGN_POOL_MIN_BATCH:
+            try:
+                return await _sign_put_urls_in_pool(bucket, items, expiration)
+            except BrokenProcessPool:
+                # The cached executor stays broken; drop it so the next batch starts a fresh pool
+                logger.warning("Presign pool is broken; recreating it and signing this batch in a thread")
+                shutdown_presign_pool()
+        return await asyncio.to_thread(_sign_put_urls, bucket, items, expiration)
+    except Exception as e:
+        logger.error(f"Error generating {len(items)} presigned URLs: {e}", exc_info=True)
+        raise
+
+async def _sign_put_urls_in_pool(bucket: str, items: list[tuple[str, str]], expiration: int) -> list[str]:
+    """Split a batch across the presign process pool, one chunk per worker."""
+    # One chunk per worker so pickling/IPC cost is paid once per process
+    size = -(-len(items) // PRESIGN_POOL_WORKERS)
+    loop = asyncio.get_running_loop()
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(get_presign_pool(), _sign_put_urls, bucket, items[i:i + size], expiration)
+        for i in range(0, len(items), size)
+    ), return_exceptions=True)
+    # A dead worker fails every chunk; collect them all so none is left unretrieved
+    for batch in batches:
+        if isinstance(batch, BaseException):
+            raise batch
+    logger.info(f"Signed {len(items)} single-put URLs across {len(batches)} processes")
+    return [url for batch in batches for url in batch]
+
 async def initiate_multipart_upload(bucket: str, object_key: str, content_type: str) -> str:
     """Initiates a multipart upload and returns the UploadId."""
     try:
-        params = {
-            'Bucket': bucket,
-            'Key': object_key,
-            'ContentType': content_type,
-        }
-        # Rule: Only add KMS if configured
-        if settings.KMS_KEY_ID:
-            params['ServerSideEncryption'] = 'aws:kms'
-            params['SSEKMSKeyId'] = settings.KMS_KEY_ID
-            
+        params = _object_params(bucket, object_key, content_type)
         client = get_s3_client()
-        response = client.create_multipart_upload(**params)
+        response = await asyncio.to_thread(client.create_multipart_upload, **params)
         upload_id = response['UploadId']
         logger.info(f"Initiated multipart upload: {upload_id}")
         return upload_id
@@ -92,7 +170,8 @@ async def abort_multipart_upload(bucket: str, object_key: str, upload_id: str) -
     """Abort an incomplete multipart upload to save costs."""
     try:
         client = get_s3_client()
-        client.abort_multipart_upload(
+        await asyncio.to_thread(
+            client.abort_multipart_upload,
             Bucket=bucket,
             Key=object_key,
             UploadId=upload_id
@@ -101,6 +180,26 @@ async def abort_multipart_upload(bucket: str, object_key: str, upload_id: str) -
     except ClientError as e:
         logger.error(f"Failed to abort multipart upload {upload_id}: {e}", exc_info=True)
 
+def _sign_part_urls(
+    bucket: str, object_key: str, upload_id: str, part_numbers: list[int], expiration: int
+) -> list[str]:
+    """Sign upload_part URLs for a multipart upload; runs in a worker thread."""
+    _check_presign_lifetime(expiration)
+    client = get_presign_client()
+    return [
+        client.generate_presigned_url(
+            'upload_part',
+            Params={
+                'Bucket': bucket,
+                'Key': object_key,
+                'UploadId': upload_id,
+                'PartNumber': part_number
+            },
+            ExpiresIn=expiration
+        )
+        for part_number in part_numbers
+    ]
+
 async def generate_part_presigned_url(
     bucket: str,
     object_key: str,
@@ -110,22 +209,32 @@ async def generate_part_presigned_url(
 ) -> str:
     """Generates a presigned URL for a specific part of a multipart upload."""
     try:
-        client = get_s3_client()
-        url = client.generate_presigned_url(
-            'upload_part',
-            Params={
-                'Bucket': bucket,
-                'Key': object_key,
-                'UploadId': upload_id,
-                'PartNumber': part_number
-            },
-            ExpiresIn=expiration
+        [url] = await asyncio.to_thread(
+            _sign_part_urls, bucket, object_key, upload_id, [part_number], expiration
         )
         return url
     except Exception as e:
         logger.error(f"Error generating part URL for {object_key} part {part_number}: {e}", exc_info=True)
         raise
 
+async def generate_part_presigned_urls(
+    bucket: str,
+    object_key: str,
+    upload_id: str,
+    part_numbers: list[int],
+    expiration: int = 3600
+) -> list[str]:
+    """Presign many parts of a multipart upload in a single worker thread."""
+    try:
+        # Signing is CPU-bound and GIL-held; one thread hop for the whole batch keeps
+        # the event loop free without paying a hop per part
+        return await asyncio.to_thread(
+            _sign_part_urls, bucket, object_key, upload_id, part_numbers, expiration
+        )
+    except Exception as e:
+        logger.error(f"Error generating {len(part_numbers)} part URLs for {object_key}: {e}", exc_info=True)
+        raise
+
 async def complete_multipart_upload(
     bucket: str,
     object_key: str,
@@ -135,7 +244,9 @@ async def complete_multipart_upload(
     """Completes a multipart upload by merging all parts."""
     try:
         client = get_s3_client()
-        response = client.complete_multipart_upload(
+        # CompleteMultipartUpload can take seconds on large objects
+        response = await asyncio.to_thread(
+            client.complete_multipart_upload,
             Bucket=bucket,
             Key=object_key,
             UploadId=upload_id,
@@ -1,7 +1,9 @@
+import asyncio
 from datetime import datetime
 import hashlib
 import uuid
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 
 from src.repositories.upload_repository import UploadRepository
 from src.utils.validators import validate_file_type, validate_file_size
@@ -9,14 +11,35 @@ from src.core.config import settings
 from src.core.logging import logger
 from src.schemas.upload_schema import (
     UploadRequest, UploadResponse, BulkUploadRequest, BulkUploadResponse,
-    MultipartPartResponse, MultipartCompleteRequest
+    MultipartPartResponse, MultipartPartsResponse, MultipartCompleteRequest
 )
 from src.services.s3_service import (
-    generate_presigned_url, generate_part_presigned_url, complete_multipart_upload
+    generate_presigned_url, generate_presigned_put_urls, generate_part_presigned_url,
+    generate_part_presigned_urls, complete_multipart_upload, abort_multipart_upload, build_object_url
 )
 
+# Processing stages initialised as 'pending' for every new upload
+_COMPONENTS = (
+    'transcription', 'entity_extraction', 'sentiment_analysis',
+    'visual_processing', 'postprocessing', 'scene_detection', 'person_tracking'
+)
+
+# Multipart part sizing: S3 requires >= 5MB parts (except the last) and allows
+# at most 10,000 parts; targeting ~1000 parts keeps part count and size balanced
+_MIN_PART_SIZE = 5 * 1024 * 1024
+_MAX_PART_SIZE = 64 * 1024 * 1024
+_TARGET_PART_COUNT = 1000
+
+@lru_cache(maxsize=4096)
+def _metadata_hash(filename: str, size: int, mime_type: str) -> str:
+    """Generate a hash for duplicate detection; retries and re-uploads hit the cache."""
+    hash_input = f"{filename}:{size}:{mime_type}"
+    return hashlib.sha256(hash_input.encode()).hexdigest()
+
 class UploadService:
     """Rule 3.2: Business logic for handling media uploads."""
+    __slots__ = ("repository",)
+
     def __init__(self, repository: UploadRepository):
         self.repository = repository
 
@@ -30,6 +53,8 @@ class UploadService:
         3. Decides and executes the upload protocol (Single PUT or Multipart).
         4. Persists the initial content metadata and processing states to the database.
         
+        For single PUT uploads, step 3 overlaps step 4; rows commit only after signing succeeds.
+        
         Args:
             request: Metadata for the file to be uploaded.
             
@@ -40,62 +65,20 @@ class UploadService:
             ValueError: If validation fails or processing limits are exceeded.
         """
         try:
-            # 1. Validate
-            category = validate_file_type(request.filename)
-            validate_file_size(request.file_size, category)
-            
-            # 2. Generate identifiers
-            upload_id = uuid.uuid4()
-            timestamp = datetime.now().strftime("%Y%m%d")
-            object_key = f"incoming/{timestamp}/{upload_id}/{request.filename}"
+            upload_id, object_key = self._prepare_upload(request)
+            is_multipart = self._is_multipart(request)
             
-            # 3. S3 Integration (Check threshold)
-            is_multipart = request.file_size >= 100 * 1024 * 1024
-            
-            presigned_result = await generate_presigned_url(
-                bucket=settings.S3_BUCKET,
-                object_key=object_key,
-                file_size=request.file_size,
-                content_type=request.content_type
-            )
-            
-            # 4. Database Persistence
-            metadata_hash = self._generate_metadata_hash(
-                request.filename, request.file_size, request.content_type
-            )
-            
-            # Create content record
-            self.repository.create_content_record(
-                content_id=upload_id,
-                source_bucket=settings.S3_BUCKET,
-                source_key=object_key,
-                original_filename=request.filename,
-                file_size_bytes=request.file_size,
-                mime_type=request.content_type,
-                metadata_hash=metadata_hash,
-                processing_config=request.processing_config or {},
-                status='pending',
-                s3_upload_id=presigned_result if is_multipart else None
-            )
-            
-            # Initialize component statuses
-            components = [
-                'transcription', 'entity_extraction', 'sentiment_analysis',
-                'visual_processing', 'postprocessing', 'scene_detection', 'person_tracking'
-            ]
-            for component in components:
-                self.repository.create_component_status(content_id=upload_id, component=component)
+            if is_multipart:
+                # The row stores S3's UploadId, so initiation must finish first
+                presigned_result = await self._presign(request, object_key)
+                await self.repository.create_content_with_components(
+                    self._content_row(request, upload_id, object_key, presigned_result), _COMPONENTS
+                )
+            else:
+                presigned_result = await self._sign_while_writing(request, upload_id, object_key)
             
             logger.info(f"Upload initiated successfully: {upload_id} (Multipart: {is_multipart})")
-            
-            return UploadResponse(
-                upload_id=str(upload_id),
-                object_key=object_key,
-                is_multipart=is_multipart,
-                presigned_url=presigned_result if not is_multipart else None,
-                s3_upload_id=presigned_result if is_multipart else None,
-                expires_in=settings.PRESIGNED_URL_EXPIRY
-            )
+            return self._build_response(request, upload_id, object_key, presigned_result)
             
         except ValueError as e:
             logger.warning(f"Validation error during upload initiation: {e}")
@@ -108,23 +91,44 @@ class UploadService:
         """
         Initiate multiple media uploads in a single transactional batch.
         
-        Currently processes each upload sequentially to ensure database integrity 
-        and returns a collection of initiation results.
+        Every file is validated before any S3 or database work starts. Single-PUT
+        URLs are then signed as one batch while multipart uploads are initiated
+        concurrently, and all rows are written with a single bulk insert and commit.
+        If presigning or the insert fails, every multipart upload already created
+        for the batch is aborted so none is left orphaned in S3.
         
         Args:
             request: Collection of upload requests.
             
         Returns:
             BulkUploadResponse containing individual UploadResponse objects.
+            
+        Raises:
+            ValueError: If any file fails validation.
         """
         logger.info(f"Initiating bulk upload for {len(request.uploads)} files")
-        results = []
-        for upload_req in request.uploads:
-            # We reuse the existing initiate_upload logic
-            result = await self.initiate_upload(upload_req)
-            results.append(result)
+        date_prefix = datetime.now().strftime("%Y%m%d")
+        prepared = [self._prepare_upload(upload_req, date_prefix) for upload_req in request.uploads]
+        presigned_results = await self._presign_all(request.uploads, prepared)
+        
+        content_rows, component_rows, results = [], [], []
+        for upload_req, (upload_id, object_key), presigned_result in zip(request.uploads, prepared, presigned_results):
+            s3_upload_id = presigned_result if self._is_multipart(upload_req) else None
+            content_rows.append(self._content_row(upload_req, upload_id, object_key, s3_upload_id))
+            component_rows.extend(
+                {"content_id": upload_id, "component": component, "status": "pending"}
+                for component in _COMPONENTS
+            )
+            results.append(self._build_response(upload_req, upload_id, object_key, presigned_result))
         
-        return BulkUploadResponse(results=results)
+        try:
+            await self.repository.bulk_create_content_records(content_rows, component_rows)
+        except Exception:
+            await self._abort_multipart_uploads(
+                [(row["source_key"], row["s3_upload_id"]) for row in content_rows if row["s3_upload_id"]]
+            )
+            raise
+        return BulkUploadResponse.model_construct(results=results)
 
     async def get_multipart_part_url(self, upload_id: uuid.UUID, part_number: int) -> MultipartPartResponse:
         """
@@ -140,7 +144,7 @@ class UploadService:
         Raises:
             ValueError: If the upload session is non-existent or not a multipart type.
         """
-        record = self.repository.get_content_by_id(upload_id)
+        record = await self.repository.get_content_by_id(upload_id)
         if not record or not record.s3_upload_id:
             raise ValueError(f"No active multipart upload found for {upload_id}")
 
@@ -151,12 +155,47 @@ class UploadService:
             part_number=part_number
         )
         
-        return MultipartPartResponse(
+        return MultipartPartResponse.model_construct(
             upload_id=str(upload_id),
             part_number=part_number,
             presigned_url=url
         )
 
+    async def get_multipart_part_urls(self, upload_id: uuid.UUID, part_numbers: list[int]) -> MultipartPartsResponse:
+        """
+        Retrieve presigned URLs for several parts of a multipart upload in one call.
+        
+        Lets clients prefetch every part URL up front instead of paying one API
+        round-trip per part. Presigning is local to boto3, so no S3 calls are made.
+        
+        Args:
+            upload_id: The UUID of the initiated upload.
+            part_numbers: The part indexes (1-based) to generate URLs for.
+            
+        Returns:
+            MultipartPartsResponse with one presigned URL per requested part.
+            
+        Raises:
+            ValueError: If the upload session is non-existent or not a multipart type.
+        """
+        record = await self.repository.get_content_by_id(upload_id)
+        if not record or not record.s3_upload_id:
+            raise ValueError(f"No active multipart upload found for {upload_id}")
+
+        urls = await generate_part_presigned_urls(
+            bucket=record.source_bucket,
+            object_key=record.source_key,
+            upload_id=record.s3_upload_id,
+            part_numbers=part_numbers
+        )
+        upload_id_str = str(upload_id)
+        parts = [
+            MultipartPartResponse.model_construct(upload_id=upload_id_str, part_number=part_number, presigned_url=url)
+            for part_number, url in zip(part_numbers, urls)
+        ]
+
+        return MultipartPartsResponse.model_construct(upload_id=upload_id_str, parts=parts)
+
     async def complete_multipart_upload(self, upload_id: uuid.UUID, request: MultipartCompleteRequest) -> Dict[str, Any]:
         """
         Finalize a multipart upload by merging all segments on S3.
@@ -174,12 +213,12 @@ class UploadService:
         Raises:
             ValueError: If the upload session is invalid.
         """
-        record = self.repository.get_content_by_id(upload_id)
+        record = await self.repository.get_content_by_id(upload_id)
         if not record or not record.s3_upload_id:
             raise ValueError(f"No active multipart upload found for {upload_id}")
 
-        # Map to S3 expected format
-        parts_data = [part.model_dump() for part in request.parts]
+        # Map to S3 expected format; plain dict literals skip per-part model_dump()
+        parts_data = [{'PartNumber': part.PartNumber, 'ETag': part.ETag} for part in request.parts]
         
         result = await complete_multipart_upload(
             bucket=record.source_bucket,
@@ -189,11 +228,147 @@ class UploadService:
         )
         
         # Mark as pending for processing (or uploaded)
-        self.repository.update_status(upload_id, 'uploaded')
+        await self.repository.update_status(upload_id, 'uploaded')
         
-        return {"status": "success", "detail": "Multipart upload completed", "location": result.get('Location')}
+        location = result.get('Location') or build_object_url(record.source_bucket, record.source_key)
+        return {"status": "success", "detail": "Multipart upload completed", "location": location}
+
+    def _prepare_upload(self, request: UploadRequest, date_prefix: Optional[str] = None) -> Tuple[uuid.UUID, str]:
+        """
+        Validate an upload request and generate its content ID and S3 object key.
+        Bulk callers pass a date_prefix computed once so every key in the batch shares it.
+        """
+        category = validate_file_type(request.filename)
+        validate_file_size(request.file_size, category)
+        
+        upload_id = uuid.uuid4()
+        timestamp = date_prefix or datetime.now().strftime("%Y%m%d")
+        # .hex is the 32-char undashed form: cheaper to format and shorter in signed URLs
+        return upload_id, f"incoming/{timestamp}/{upload_id.hex}/{request.filename}"
+
+    def _is_multipart(self, request: UploadRequest) -> bool:
+        """Files at or above 100MB use S3 multipart upload."""
+        return request.file_size >= 100 * 1024 * 1024
+
+    def _part_size(self, file_size: int) -> int:
+        """Pick a multipart part size that scales with the file, within S3 limits."""
+        return max(_MIN_PART_SIZE, min(_MAX_PART_SIZE, -(-file_size // _TARGET_PART_COUNT)))
+
+    async def _presign(self, request: UploadRequest, object_key: str) -> str:
+        """Return a single-PUT presigned URL or a multipart UploadId for the object."""
+        return await generate_presigned_url(
+            bucket=settings.S3_BUCKET,
+            object_key=object_key,
+            file_size=request.file_size,
+            content_type=request.content_type
+        )
 
-    def _generate_metadata_hash(self, filename: str, size: int, mime_type: str) -> str:
-        """Generate a hash for duplicate detection."""
-        hash_input = f"{filename}:{size}:{mime_type}"
-        return hashlib.sha256(hash_input.encode()).hexdigest()
+    async def _sign_while_writing(
+        self, request: UploadRequest, upload_id: uuid.UUID, object_key: str
+    ) -> str:
+        """
+        Sign a single-PUT URL in the background while the content rows are staged.
+        
+        The rows are flushed but only committed once signing succeeds, so a signing
+        failure leaves nothing behind. Both steps finish before any error propagates,
+        so the request-scoped session is never used after the caller closes it.
+        """
+        sign_task = asyncio.create_task(self._presign(request, object_key))
+        try:
+            await self.repository.stage_content_with_components(
+                self._content_row(request, upload_id, object_key, None), _COMPONENTS
+            )
+            presigned_result = await sign_task
+        except BaseException:
+            sign_task.cancel()
+            # If staging failed first, a later signing error is never awaited; mark it retrieved
+            sign_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            await self.repository.rollback()
+            raise
+        await self.repository.commit()
+        return presigned_result
+
+    async def _presign_all(
+        self, uploads: list[UploadRequest], prepared: list[Tuple[uuid.UUID, str]]
+    ) -> list[str]:
+        """Presign a bulk batch, returning URLs or UploadIds in request order."""
+        single = [i for i, upload_req in enumerate(uploads) if not self._is_multipart(upload_req)]
+        multi = [i for i, upload_req in enumerate(uploads) if self._is_multipart(upload_req)]
+        # CreateMultipartUpload is a real S3 call per file; cap how many run at once
+        limit = asyncio.Semaphore(settings.S3_BULK_CONCURRENCY)
+
+        async def initiate(i: int) -> str:
+            async with limit:
+                return await self._presign(uploads[i], prepared[i][1])
+
+        # Nothing is cancelled mid-flight: every initiation finishes, so each UploadId
+        # S3 hands out is known and can be aborted if any part of the batch failed
+        urls, s3_upload_ids = await asyncio.gather(
+            generate_presigned_put_urls(
+                settings.S3_BUCKET, [(prepared[i][1], uploads[i].content_type) for i in single]
+            ),
+            asyncio.gather(*(initiate(i) for i in multi), return_exceptions=True),
+            return_exceptions=True,
+        )
+        await self._raise_presign_failure(urls, s3_upload_ids, [prepared[i][1] for i in multi])
+        results = [None] * len(uploads)
+        for i, value in zip(single + multi, urls + list(s3_upload_ids)):
+            results[i] = value
+        return results
+
+    async def _raise_presign_failure(
+        self, urls: Any, s3_upload_ids: list, multipart_keys: list[str]
+    ) -> None:
+        """Re-raise the first presign error of a batch after aborting the uploads it did create."""
+        error = next((r for r in (urls, *s3_upload_ids) if isinstance(r, BaseException)), None)
+        if error is None:
+            return
+        await self._abort_multipart_uploads([
+            (object_key, s3_upload_id) for object_key, s3_upload_id in zip(multipart_keys, s3_upload_ids)
+            if not isinstance(s3_upload_id, BaseException)
+        ])
+        raise error
+
+    async def _abort_multipart_uploads(self, uploads: list[Tuple[str, str]]) -> None:
+        """Abort (object_key, s3_upload_id) multipart uploads that no row will ever reference."""
+        if not uploads:
+            return
+        logger.warning(f"Aborting {len(uploads)} multipart uploads from a failed bulk request")
+        # Best effort: an abort failure must never mask the error that failed the batch
+        await asyncio.gather(*(
+            abort_multipart_upload(settings.S3_BUCKET, object_key, s3_upload_id)
+            for object_key, s3_upload_id in uploads
+        ), return_exceptions=True)
+
+    def _content_row(
+        self, request: UploadRequest, upload_id: uuid.UUID, object_key: str, s3_upload_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the content_inventory column values for a new upload."""
+        return {
+            "content_id": upload_id,
+            "source_bucket": settings.S3_BUCKET,
+            "source_key": object_key,
+            "original_filename": request.filename,
+            "file_size_bytes": request.file_size,
+            "mime_type": request.content_type,
+            "metadata_hash": _metadata_hash(request.filename, request.file_size, request.content_type),
+            "processing_config": request.processing_config or {},
+            "status": "pending",
+            "s3_upload_id": s3_upload_id,
+        }
+
+    def _build_response(
+        self, request: UploadRequest, upload_id: uuid.UUID, object_key: str, presigned_result: str
+    ) -> UploadResponse:
+        """Build the API response for an initiated upload."""
+        is_multipart = self._is_multipart(request)
+        # Every field is generated here, not client input, so skip re-validation
+        return UploadResponse.model_construct(
+            upload_id=str(upload_id),
+            object_key=object_key,
+            is_multipart=is_multipart,
+            presigned_url=presigned_result if not is_multipart else None,
+            s3_upload_id=presigned_result if is_multipart else None,
+            part_size=self._part_size(request.file_size) if is_multipart else None,
+            expires_in=settings.PRESIGNED_URL_EXPIRY
+        )
@@ -1,13 +1,17 @@
-from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Optional
 from src.core.logging import logger
 
 # Supported file types and their extensions
-SUPPORTED_TYPES: Dict[str, List[str]] = {
-    'video': ['.mp4', '.mov', '.avi', '.mkv'],
-    'audio': ['.mp3', '.wav', '.m4a', '.flac'],
-    'image': ['.jpg', '.jpeg', '.png', '.webp', '.tiff'],
-    'text': ['.txt', '.md', '.html', '.json']
+SUPPORTED_TYPES: Dict[str, FrozenSet[str]] = {
+    'video': frozenset({'.mp4', '.mov', '.avi', '.mkv'}),
+    'audio': frozenset({'.mp3', '.wav', '.m4a', '.flac'}),
+    'image': frozenset({'.jpg', '.jpeg', '.png', '.webp', '.tiff'}),
+    'text': frozenset({'.txt', '.md', '.html', '.json'})
+}
+
+# Inverted once at import: one dict lookup per file instead of scanning every list
+EXT_TO_CATEGORY: Dict[str, str] = {
+    ext: category for category, extensions in SUPPORTED_TYPES.items() for ext in extensions
 }
 
 # Max file sizes per category
@@ -18,6 +22,9 @@ MAX_FILE_SIZES: Dict[str, int] = {
     'text': 500 * 1024 * 1024            # 500 MB
 }
 
+_GLOBAL_MAX_BYTES = 10 * 1024 ** 3  # 10 GB, applies to every category
+_DEFAULT_MAX_BYTES = MAX_FILE_SIZES['video']  # Limit for categories without their own entry
+
 def validate_file_type(filename: str) -> str:
     """
     Validate file extension and return its category.
@@ -31,11 +38,14 @@ def validate_file_type(filename: str) -> str:
     Raises:
         ValueError: If the file type is unsupported.
     """
-    ext = Path(filename).suffix.lower()
-    
-    for category, extensions in SUPPORTED_TYPES.items():
-        if ext in extensions:
-            return category
+    # Slicing instead of Path(filename).suffix: a dot that starts the name (".mp4",
+    # "dir/.mp4") is a hidden file, not a suffix. Unlike Path on POSIX, "\\" counts as
+    # a separator and a trailing slash is not stripped, so "a.mp4/" is rejected
+    idx = filename.rfind('.')
+    ext = filename[idx:].lower() if idx > 0 and filename[idx - 1] not in '/\\' else ''
+    category = EXT_TO_CATEGORY.get(ext)
+    if category:
+        return category
     
     logger.warning(f"Unsupported file type attempted: {ext} for file {filename}")
     raise ValueError(f"Unsupported file type: {ext}")
@@ -55,15 +65,14 @@ def validate_file_size(file_size: int, category: Optional[str] = None) -> bool:
         ValueError: If file size exceeds limits.
     """
     if category:
-        max_size = MAX_FILE_SIZES.get(category, MAX_FILE_SIZES['video'])
+        max_size = MAX_FILE_SIZES.get(category, _DEFAULT_MAX_BYTES)
         if file_size > max_size:
             logger.warning(f"File size {file_size} exceeds {category} limit {max_size}")
             raise ValueError(f"File size exceeds limit for {category}: {max_size} bytes")
     
     # Global max limit (10 GB)
-    global_max = 10 * 1024 * 1024 * 1024
-    if file_size > global_max:
-        logger.warning(f"File size {file_size} exceeds global limit {global_max}")
+    if file_size > _GLOBAL_MAX_BYTES:
+        logger.warning(f"File size {file_size} exceeds global limit {_GLOBAL_MAX_BYTES}")
         raise ValueError("File size exceeds global limit of 10 GB")
     
     return True
@@ -1,36 +1,61 @@
+import os
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+
+# Tests own their schema; keep the app lifespan from creating tables in its own DB
+os.environ["ENV"] = "test"
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 from src.main import app
 from src.core.database import Base, get_db
 
 # Use in-memory SQLite for tests (Rule 12)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# StaticPool keeps the single connection that owns the in-memory database, so the
+# schema survives across sessions and event loops for the whole run
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(scope="session", autouse=True)
+async def setup_schema():
+    """Rule 12: Create the schema once for the whole test session."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Rule 12: DB setup/teardown fixture."""
-    Base.metadata.create_all(bind=engine)
+async def setup_db():
+    """Rule 12: Per-test isolation by emptying tables instead of re-running DDL."""
+    async with engine.begin() as conn:
+        # Children first so foreign keys never point at deleted rows
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
     yield
-    Base.metadata.drop_all(bind=engine)
 
-def override_get_db():
+async def override_get_db():
     """Override get_db dependency for tests."""
-    try:
-        db = TestingSessionLocal()
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
 
 @pytest.fixture
-def client():
-    """FastAPI TestClient fixture."""
-    return TestClient(app)
+async def db_session():
+    """A session on the test database for tests that drive the repository directly."""
+    async with TestingSessionLocal() as db:
+        yield db
+
+# pytest.ini runs every test and fixture on one session-wide event loop, so a single
+# client (and its connection pool) can be shared by all API tests
+@pytest.fixture(scope="session")
+async def client():
+    """Async HTTP client fixture, created once for the whole session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
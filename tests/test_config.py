@@ -0,0 +1,12 @@
+import pytest
+from src.core.config import Settings
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+    ("postgresql://user:pw@db/media", "postgresql+asyncpg://user:pw@db/media"),
+    ("postgres://user:pw@db/media", "postgresql+asyncpg://user:pw@db/media"),
+    ("postgresql+asyncpg://user:pw@db/media", "postgresql+asyncpg://user:pw@db/media"),
+])
+def test_database_url_uses_async_driver(url, expected):
+    """Test that sync database URLs from older .env files are mapped to async drivers."""
+    assert Settings(DATABASE_URL=url).DATABASE_URL == expected
@@ -0,0 +1,25 @@
+import logging
+import queue
+import orjson
+from src.core.logging import DeferredQueueHandler, JsonFormatter
+
+def test_queued_exception_keeps_separate_exc_info():
+    """Test that tracebacks reach JsonFormatter as exc_info, not folded into the message."""
+    log_queue = queue.SimpleQueue()
+    test_logger = logging.getLogger("test.deferred_queue")
+    test_logger.propagate = False
+    test_logger.addHandler(DeferredQueueHandler(log_queue))
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        test_logger.error("Upload failed for %s", "f1.mp4", exc_info=True)
+
+    record = log_queue.get_nowait()
+    # Nothing was formatted on the logging thread
+    assert record.msg == "Upload failed for %s"
+
+    payload = orjson.loads(JsonFormatter().format(record))
+    assert payload["message"] == "Upload failed for f1.mp4"
+    assert "RuntimeError: boom" in payload["exc_info"]
+    assert "Traceback" not in payload["message"]
@@ -1,20 +1,29 @@
+import gzip
+import json
 import pytest
 import uuid
 from unittest.mock import patch, MagicMock
 from fastapi import status
 
-def test_health_check(client):
+@pytest.mark.asyncio
+async def test_health_check(client):
     """Rule 12: Basic health check test."""
-    response = client.get("/health")
+    response = await client.get("/health")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {"status": "healthy", "service": "upload-service"}
 
-@patch("src.services.s3_service.get_s3_client")
-def test_bulk_upload_success(mock_s3_client_getter, client):
+@pytest.fixture
+def mock_s3(monkeypatch):
+    """One stub S3 client served for both the signing and the API client."""
+    mock_client = MagicMock()
+    monkeypatch.setattr("src.services.s3_service.get_presign_client", lambda: mock_client)
+    monkeypatch.setattr("src.services.s3_service.get_s3_client", lambda: mock_client)
+    return mock_client
+
+@pytest.mark.asyncio
+async def test_bulk_upload_success(mock_s3, client):
     """Test successful bulk upload initiation."""
-    mock_s3 = MagicMock()
     mock_s3.generate_presigned_url.return_value = "http://mock-url"
-    mock_s3_client_getter.return_value = mock_s3
     
     bulk_data = {
         "uploads": [
@@ -23,19 +32,48 @@ def test_bulk_upload_success(mock_s3_client_getter, client):
         ]
     }
     
-    response = client.post("/api/v1/bulk-upload", json=bulk_data)
+    response = await client.post("/api/v1/bulk-upload", json=bulk_data)
     assert response.status_code == status.HTTP_201_CREATED
     data = response.json()
     assert len(data["results"]) == 2
     assert data["results"][0]["presigned_url"] == "http://mock-url"
+    # Single-PUT results still carry the multipart fields, as null
+    assert data["results"][0]["s3_upload_id"] is None
 
-def test_bulk_upload_validation_error(client):
+@pytest.mark.asyncio
+async def test_multipart_upload_round_trip(mock_s3, client):
+    """Test that a multipart upload persisted by bulk-upload can be presigned per part."""
+    mock_s3.create_multipart_upload.return_value = {"UploadId": "s3-upload-id"}
+    mock_s3.generate_presigned_url.return_value = "http://part-url"
+    
+    bulk_data = {
+        "uploads": [{"filename": "big.mp4", "file_size": 200 * 1024 * 1024, "content_type": "video/mp4"}]
+    }
+    
+    response = await client.post("/api/v1/bulk-upload", json=bulk_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    result = response.json()["results"][0]
+    assert result["s3_upload_id"] == "s3-upload-id"
+    
+    response = await client.get(f"/api/v1/{result['upload_id']}/part/1")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["presigned_url"] == "http://part-url"
+
+@pytest.mark.asyncio
+async def test_get_part_url_not_found(client):
+    """Test that an unknown upload ID returns 404."""
+    response = await client.get(f"/api/v1/{uuid.uuid4()}/part/1")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.asyncio
+async def test_bulk_upload_validation_error(client):
     """Test behavior with invalid input data (missing fields)."""
-    response = client.post("/api/v1/bulk-upload", json={"uploads": [{"filename": "v.mp4"}]})
+    response = await client.post("/api/v1/bulk-upload", json={"uploads": [{"filename": "v.mp4"}]})
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+@pytest.mark.asyncio
 @patch("src.services.upload_service.UploadService.get_multipart_part_url")
-def test_get_part_url_success(mock_get_url, client):
+async def test_get_part_url_success(mock_get_url, client):
     """Test obtaining a part presigned URL via API."""
     upload_id = str(uuid.uuid4())
     mock_get_url.return_value = MagicMock(
@@ -44,17 +82,53 @@ def test_get_part_url_success(mock_get_url, client):
         presigned_url="http://part-url"
     )
     
-    response = client.get(f"/api/v1/{upload_id}/part/1")
+    response = await client.get(f"/api/v1/{upload_id}/part/1")
     assert response.status_code == 200
     assert response.json()["presigned_url"] == "http://part-url"
 
-def test_get_part_url_invalid_uuid(client):
+@pytest.mark.asyncio
+async def test_get_part_url_invalid_uuid(client):
     """Test that invalid UUID format returns 422."""
-    response = client.get("/api/v1/not-a-uuid/part/1")
+    response = await client.get("/api/v1/not-a-uuid/part/1")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio
+@patch("src.services.upload_service.UploadService.get_multipart_part_urls")
+async def test_get_part_urls_batch_success(mock_get_urls, client):
+    """Test obtaining several part presigned URLs in one API call."""
+    upload_id = str(uuid.uuid4())
+    mock_get_urls.return_value = {
+        "upload_id": upload_id,
+        "parts": [
+            {"upload_id": upload_id, "part_number": n, "presigned_url": f"http://part-url/{n}"}
+            for n in (1, 2)
+        ]
+    }
+    
+    response = await client.post(f"/api/v1/{upload_id}/parts", json={"part_numbers": [1, 2]})
+    assert response.status_code == 200
+    assert [p["presigned_url"] for p in response.json()["parts"]] == [
+        "http://part-url/1", "http://part-url/2"
+    ]
+
+@pytest.mark.asyncio
+async def test_get_part_urls_batch_empty_list(client):
+    """Test that an empty part list is rejected with 422."""
+    response = await client.post(f"/api/v1/{uuid.uuid4()}/parts", json={"part_numbers": []})
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("part_number", [0, -1, 10001])
+async def test_get_part_urls_batch_out_of_range(client, part_number):
+    """Test that part numbers outside S3's 1-10000 range are rejected with 422."""
+    response = await client.post(f"/api/v1/{uuid.uuid4()}/parts", json={"part_numbers": [1, part_number]})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    response = await client.get(f"/api/v1/{uuid.uuid4()}/part/{part_number}")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+@pytest.mark.asyncio
 @patch("src.services.upload_service.UploadService.complete_multipart_upload")
-def test_complete_upload_success(mock_complete, client):
+async def test_complete_upload_success(mock_complete, client):
     """Test successful multipart completion via API."""
     upload_id = str(uuid.uuid4())
     mock_complete.return_value = {"status": "success", "location": "http://s3-location"}
@@ -63,6 +137,32 @@ def test_complete_upload_success(mock_complete, client):
         "parts": [{"PartNumber": 1, "ETag": "etag-123"}]
     }
     
-    response = client.post(f"/api/v1/{upload_id}/complete", json=complete_data)
+    response = await client.post(f"/api/v1/{upload_id}/complete", json=complete_data)
     assert response.status_code == 200
     assert response.json()["location"] == "http://s3-location"
+
+@pytest.mark.asyncio
+@patch("src.services.upload_service.UploadService.complete_multipart_upload")
+async def test_complete_upload_gzip_body(mock_complete, client):
+    """Test that a gzip-encoded completion body is decompressed before parsing."""
+    mock_complete.return_value = {"status": "success", "location": "http://s3-location"}
+    parts = [{"PartNumber": n, "ETag": f"etag-{n}"} for n in range(1, 101)]
+    body = gzip.compress(json.dumps({"parts": parts}).encode())
+
+    response = await client.post(
+        f"/api/v1/{uuid.uuid4()}/complete",
+        content=body,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert len(mock_complete.call_args.args[1].parts) == 100
+
+@pytest.mark.asyncio
+async def test_complete_upload_corrupt_gzip_body(client):
+    """Test that an undecodable gzip body is rejected with 400."""
+    response = await client.post(
+        f"/api/v1/{uuid.uuid4()}/complete",
+        content=b"not gzip",
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
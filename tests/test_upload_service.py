@@ -1,19 +1,38 @@
+import asyncio
 import pytest
 import uuid
+from contextlib import ExitStack
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, AsyncMock
 from src.services.upload_service import UploadService
-from src.schemas.upload_schema import UploadRequest, BulkUploadRequest, UploadResponse
+from src.schemas.upload_schema import UploadRequest, BulkUploadRequest
 from src.repositories.upload_repository import UploadRepository
+from src.core.config import settings
+
+@pytest.fixture(scope="session")
+def repo_spec():
+    """Build the spec'd repository mock once; introspecting UploadRepository is the costly part."""
+    return MagicMock(spec=UploadRepository)
 
 @pytest.fixture
-def mock_repo():
-    repo = MagicMock(spec=UploadRepository)
-    return repo
+def mock_repo(repo_spec):
+    # Clear calls and any configured return values/side effects left by the previous test
+    repo_spec.reset_mock(return_value=True, side_effect=True)
+    return repo_spec
 
 @pytest.fixture
 def service(mock_repo):
     return UploadService(repository=mock_repo)
 
+@pytest.fixture
+def presign():
+    """Patch both presigning entry points used by initiate_upload/initiate_bulk_upload."""
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            url=stack.enter_context(patch("src.services.upload_service.generate_presigned_url", new_callable=AsyncMock)),
+            put_urls=stack.enter_context(patch("src.services.upload_service.generate_presigned_put_urls", new_callable=AsyncMock)),
+        )
+
 @pytest.mark.asyncio
 async def test_initiate_upload_small_file_calls_presigned(service, mock_repo):
     """Test that files < 100MB use generate_presigned_url."""
@@ -29,8 +48,11 @@ async def test_initiate_upload_small_file_calls_presigned(service, mock_repo):
         result = await service.initiate_upload(request)
         
         assert result.presigned_url == "http://mock-url"
+        # Keys embed the undashed UUID; the API still returns the canonical form
+        assert result.object_key.split("/")[2] == uuid.UUID(result.upload_id).hex
         mock_gen_url.assert_called_once()
-        assert mock_repo.create_content_record.called
+        mock_repo.stage_content_with_components.assert_called_once()
+        mock_repo.commit.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_initiate_upload_large_file_calls_multipart(service, mock_repo):
@@ -49,33 +71,173 @@ async def test_initiate_upload_large_file_calls_multipart(service, mock_repo):
         assert result.is_multipart is True
         assert result.s3_upload_id == "mock-upload-id"
         assert result.presigned_url is None
+        assert result.part_size == 5 * 1024 * 1024
         mock_gen_url.assert_called_once()
-        assert mock_repo.create_content_record.called
+        mock_repo.create_content_with_components.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_initiate_upload_signing_failure_waits_for_db_write(service, mock_repo):
+    """Test that a signing error rolls back only after the overlapping DB write is done."""
+    request = UploadRequest(filename="small.mp4", file_size=1024, content_type="video/mp4")
+    events = []
+
+    async def slow_write(*args):
+        events.append("write started")
+        for _ in range(3):
+            await asyncio.sleep(0)
+        events.append("write finished")
+
+    mock_repo.stage_content_with_components.side_effect = slow_write
+    mock_repo.rollback.side_effect = lambda: events.append("rolled back")
+    with patch("src.services.upload_service.generate_presigned_url", new_callable=AsyncMock) as mock_gen_url:
+        mock_gen_url.side_effect = RuntimeError("no credentials")
+        with pytest.raises(RuntimeError, match="no credentials"):
+            await service.initiate_upload(request)
+        events.append("error raised")
+
+    # The caller closes the session on error; nothing may still be using it by then
+    assert events == ["write started", "write finished", "rolled back", "error raised"]
+    mock_repo.commit.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_initiate_upload_signing_failure_leaves_no_rows(db_session):
+    """Test that a failed single-PUT signing leaves no content or component rows."""
+    from sqlalchemy import func, select
+    from src.models.upload_model import ContentInventory, ComponentStatus
+    service = UploadService(repository=UploadRepository(db_session))
+    request = UploadRequest(filename="small.mp4", file_size=1024, content_type="video/mp4")
+
+    with patch("src.services.upload_service.generate_presigned_url", new_callable=AsyncMock) as mock_gen_url:
+        mock_gen_url.side_effect = RuntimeError("no credentials")
+        with pytest.raises(RuntimeError, match="no credentials"):
+            await service.initiate_upload(request)
+
+    for model in (ContentInventory, ComponentStatus):
+        assert await db_session.scalar(select(func.count()).select_from(model)) == 0
+
+@pytest.mark.asyncio
+async def test_initiate_upload_part_size_scales_with_file(service):
+    """Test that large files get bigger parts so the part count stays near 1000."""
+    request = UploadRequest(
+        filename="huge.mp4",
+        file_size=8 * 1024 * 1024 * 1024, # 8GB
+        content_type="video/mp4"
+    )
+    
+    with patch("src.services.upload_service.generate_presigned_url", new_callable=AsyncMock) as mock_gen_url:
+        mock_gen_url.return_value = "mock-upload-id"
+        
+        result = await service.initiate_upload(request)
+        
+        assert result.part_size > 8 * 1024 * 1024
+        assert -(-request.file_size // result.part_size) <= 1000
 
 @pytest.mark.asyncio
-async def test_initiate_bulk_upload_multiple_files(service):
+async def test_initiate_bulk_upload_multiple_files(service, mock_repo, presign):
     """Test bulk upload initiation with mixed file sizes."""
     bulk_request = BulkUploadRequest(uploads=[
         UploadRequest(filename="f1.mp4", file_size=10, content_type="video/mp4"),
         UploadRequest(filename="f2.mp4", file_size=200*1024*1024, content_type="video/mp4")
     ])
+    presign.put_urls.return_value = ["http://mock-url"]
+    presign.url.return_value = "mock-upload-id"
     
-    # We need to return a valid UploadResponse object so BulkUploadResponse schema can validate it
-    mock_response = UploadResponse(
-        upload_id="test-id",
-        presigned_url="http://mock-url",
-        object_key="incoming/test/key",
-        expires_in=3600
-    )
+    response = await service.initiate_bulk_upload(bulk_request)
     
-    with patch.object(service, 'initiate_upload', new_callable=AsyncMock) as mock_init:
-        mock_init.return_value = mock_response
-        
+    assert len(response.results) == 2
+    # Single-PUT files are signed as one batch; only multipart goes per file
+    assert len(presign.put_urls.call_args.args[1]) == 1
+    assert presign.url.call_count == 1
+    assert response.results[0].presigned_url == "http://mock-url"
+    assert response.results[1].s3_upload_id == "mock-upload-id"
+    
+    # All rows go to the database in a single bulk call
+    mock_repo.bulk_create_content_records.assert_called_once()
+    content_rows, component_rows = mock_repo.bulk_create_content_records.call_args.args
+    assert len(content_rows) == 2
+    assert content_rows[1]["s3_upload_id"] == "mock-upload-id"
+    assert len(component_rows) == 14
+
+@pytest.mark.asyncio
+async def test_initiate_bulk_upload_caps_multipart_concurrency(service, mock_repo):
+    """Test that multipart initiations in a bulk batch respect S3_BULK_CONCURRENCY."""
+    bulk_request = BulkUploadRequest(uploads=[
+        UploadRequest(filename=f"f{i}.mp4", file_size=200*1024*1024, content_type="video/mp4")
+        for i in range(6)
+    ])
+    in_flight, peak = 0, 0
+
+    async def fake_initiate(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return f"upload-{kwargs['object_key']}"
+
+    with patch("src.services.upload_service.settings.S3_BULK_CONCURRENCY", 2), \
+         patch("src.services.upload_service.generate_presigned_url", side_effect=fake_initiate):
         response = await service.initiate_bulk_upload(bulk_request)
-        
-        assert len(response.results) == 2
-        assert mock_init.call_count == 2
-        assert response.results[0].upload_id == "test-id"
+
+    assert peak == 2
+    assert [r.s3_upload_id for r in response.results] == [f"upload-{r.object_key}" for r in response.results]
+
+@pytest.mark.asyncio
+async def test_initiate_bulk_upload_aborts_created_multipart_on_presign_failure(service, mock_repo):
+    """Test that one failed initiation aborts the batch's other multipart uploads and writes nothing."""
+    bulk_request = BulkUploadRequest(uploads=[
+        UploadRequest(filename=f"f{i}.mp4", file_size=200*1024*1024, content_type="video/mp4")
+        for i in range(3)
+    ])
+
+    async def initiate(**kwargs):
+        if kwargs["object_key"].endswith("f1.mp4"):
+            raise RuntimeError("S3 unavailable")
+        return f"upload-{kwargs['object_key']}"
+
+    with patch("src.services.upload_service.generate_presigned_url", side_effect=initiate), \
+         patch("src.services.upload_service.abort_multipart_upload", new_callable=AsyncMock) as mock_abort:
+        with pytest.raises(RuntimeError, match="S3 unavailable"):
+            await service.initiate_bulk_upload(bulk_request)
+
+    aborted = sorted(call.args[1].rsplit("/", 1)[1] for call in mock_abort.call_args_list)
+    assert aborted == ["f0.mp4", "f2.mp4"]
+    assert all(call.args[2] == f"upload-{call.args[1]}" for call in mock_abort.call_args_list)
+    mock_repo.bulk_create_content_records.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_initiate_bulk_upload_aborts_multipart_on_db_failure(service, mock_repo, presign):
+    """Test that a failed bulk insert aborts every multipart upload created for the batch."""
+    bulk_request = BulkUploadRequest(uploads=[
+        UploadRequest(filename="f1.mp4", file_size=10, content_type="video/mp4"),
+        UploadRequest(filename="f2.mp4", file_size=200*1024*1024, content_type="video/mp4")
+    ])
+    presign.put_urls.return_value = ["http://mock-url"]
+    presign.url.return_value = "mock-upload-id"
+    mock_repo.bulk_create_content_records.side_effect = RuntimeError("db down")
+
+    with patch("src.services.upload_service.abort_multipart_upload", new_callable=AsyncMock) as mock_abort:
+        with pytest.raises(RuntimeError, match="db down"):
+            await service.initiate_bulk_upload(bulk_request)
+
+    mock_abort.assert_called_once()
+    assert mock_abort.call_args.args[1].endswith("/f2.mp4")
+    assert mock_abort.call_args.args[2] == "mock-upload-id"
+
+@pytest.mark.asyncio
+async def test_initiate_bulk_upload_validates_before_presign(service, mock_repo, presign):
+    """Test that one invalid file rejects the batch before any S3 or DB work."""
+    bulk_request = BulkUploadRequest(uploads=[
+        UploadRequest(filename="f1.mp4", file_size=10, content_type="video/mp4"),
+        UploadRequest(filename="f2.exe", file_size=10, content_type="application/octet-stream")
+    ])
+    
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        await service.initiate_bulk_upload(bulk_request)
+    
+    presign.put_urls.assert_not_called()
+    presign.url.assert_not_called()
+    mock_repo.bulk_create_content_records.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_get_multipart_part_url_success(service, mock_repo):
@@ -102,6 +264,33 @@ async def test_get_multipart_part_url_not_found(service, mock_repo):
     with pytest.raises(ValueError, match="No active multipart upload found"):
         await service.get_multipart_part_url(uuid.uuid4(), 1)
 
+@pytest.mark.asyncio
+async def test_get_multipart_part_urls_batch(service, mock_repo):
+    """Test obtaining presigned URLs for several parts in one call."""
+    upload_id = uuid.uuid4()
+    mock_record = MagicMock()
+    mock_record.s3_upload_id = "s3-id-123"
+    mock_record.source_bucket = "bucket"
+    mock_record.source_key = "key"
+    mock_repo.get_content_by_id.return_value = mock_record
+    
+    with patch("src.services.upload_service.generate_part_presigned_urls", new_callable=AsyncMock) as mock_gen_urls:
+        mock_gen_urls.side_effect = lambda **kwargs: [f"http://part-url/{n}" for n in kwargs['part_numbers']]
+        
+        result = await service.get_multipart_part_urls(upload_id, [1, 2, 3])
+        
+        assert [p.part_number for p in result.parts] == [1, 2, 3]
+        assert result.parts[2].presigned_url == "http://part-url/3"
+        mock_gen_urls.assert_awaited_once()
+        mock_repo.get_content_by_id.assert_called_once_with(upload_id)
+
+@pytest.mark.asyncio
+async def test_get_multipart_part_urls_not_found(service, mock_repo):
+    """Test that batch part URLs for a non-existent upload ID fail."""
+    mock_repo.get_content_by_id.return_value = None
+    with pytest.raises(ValueError, match="No active multipart upload found"):
+        await service.get_multipart_part_urls(uuid.uuid4(), [1])
+
 @pytest.mark.asyncio
 async def test_complete_multipart_upload_success(service, mock_repo):
     """Test finalizing a multipart upload."""
@@ -121,6 +310,27 @@ async def test_complete_multipart_upload_success(service, mock_repo):
         assert result["status"] == "success"
         mock_repo.update_status.assert_called_with(upload_id, "uploaded")
 
+@pytest.mark.asyncio
+async def test_complete_multipart_upload_builds_missing_location(service, mock_repo):
+    """Test that the object URL is built locally when S3 omits Location."""
+    mock_record = MagicMock()
+    mock_record.s3_upload_id = "s3-id-123"
+    mock_record.source_bucket = "bucket"
+    mock_record.source_key = "incoming/20250101/id/my video.mp4"
+    mock_repo.get_content_by_id.return_value = mock_record
+    
+    from src.schemas.upload_schema import MultipartCompleteRequest, MultipartCompletePart
+    request = MultipartCompleteRequest(parts=[MultipartCompletePart(PartNumber=1, ETag="test-etag")])
+    
+    with patch("src.services.upload_service.complete_multipart_upload", new_callable=AsyncMock) as mock_complete:
+        mock_complete.return_value = {}
+        
+        result = await service.complete_multipart_upload(uuid.uuid4(), request)
+        
+        assert result["location"] == (
+            f"https://bucket.s3.{settings.AWS_REGION}.amazonaws.com/incoming/20250101/id/my%20video.mp4"
+        )
+
 @pytest.mark.asyncio
 async def test_upload_validation_invalid_type(service):
     """Test that invalid file extensions are rejected."""
@@ -128,6 +338,15 @@ async def test_upload_validation_invalid_type(service):
     with pytest.raises(ValueError, match="Unsupported file type"):
         await service.initiate_upload(request)
 
+def test_upload_validation_extension_parsing():
+    """Test that extensions match case-insensitively and dot-files have no extension."""
+    from src.utils.validators import validate_file_type
+    assert validate_file_type("Holiday.Final.MP4") == "video"
+    # Stricter than Path.suffix: backslash is a separator and trailing slashes are kept
+    for filename in (".mp4", "clips/.mp4", "noext", "clips\\.mp4", "a.mp4/"):
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            validate_file_type(filename)
+
 @pytest.mark.asyncio
 async def test_upload_validation_exceeds_size(service):
     """Test that files exceeding category size limits are rejected."""
@@ -135,3 +354,55 @@ async def test_upload_validation_exceeds_size(service):
     request = UploadRequest(filename="huge.mp4", file_size=11 * 1024 * 1024 * 1024, content_type="video/mp4")
     with pytest.raises(ValueError, match="File size exceeds limit"):
         await service.initiate_upload(request)
+
+@pytest.mark.asyncio
+async def test_presign_lifetime_check_runs_off_loop_and_warns_once(monkeypatch):
+    """Test that the credential check runs in the signing thread and warns once per credential set."""
+    import threading
+    from src.services import s3_service
+    check_threads = []
+
+    def short_credentials(seconds):
+        check_threads.append(threading.current_thread())
+        return False
+
+    credentials = MagicMock()
+    credentials.get_frozen_credentials.return_value.access_key = "ASIA-ROLE-1"
+    monkeypatch.setattr(s3_service, "presign_credentials_cover", short_credentials)
+    monkeypatch.setattr(s3_service.presign_session, "get_credentials", lambda: credentials)
+    monkeypatch.setattr(s3_service, "get_presign_client", MagicMock)
+    s3_service._warn_short_credentials.cache_clear()
+
+    with patch.object(s3_service, "logger") as mock_logger:
+        await s3_service.generate_part_presigned_urls("bucket", "key", "upload-id", [1, 2])
+        await s3_service.generate_part_presigned_url("bucket", "key", "upload-id", 3)
+
+    assert len(check_threads) == 2
+    assert threading.main_thread() not in check_threads
+    mock_logger.warning.assert_called_once()
+    s3_service._warn_short_credentials.cache_clear()
+
+@pytest.mark.asyncio
+async def test_presigned_put_urls_recover_from_broken_pool(monkeypatch):
+    """Test that a broken process pool is discarded and the batch is signed in a thread."""
+    from concurrent.futures import Executor
+    from concurrent.futures.process import BrokenProcessPool
+    from src.services import s3_service
+
+    class BrokenPool(Executor):
+        def submit(self, fn, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+    shutdown = MagicMock()
+    client = MagicMock()
+    client.generate_presigned_url.side_effect = lambda *args, **kwargs: kwargs["Params"]["Key"]
+    monkeypatch.setattr(s3_service, "get_presign_pool", BrokenPool)
+    monkeypatch.setattr(s3_service, "shutdown_presign_pool", shutdown)
+    monkeypatch.setattr(s3_service, "get_presign_client", lambda: client)
+    monkeypatch.setattr(s3_service.settings, "PRESIGN_POOL_MIN_BATCH", 2)
+
+    items = [(f"key-{i}", "video/mp4") for i in range(3)]
+    urls = await s3_service.generate_presigned_put_urls("bucket", items)
+
+    assert urls == ["key-0", "key-1", "key-2"]
+    shutdown.assert_called_once()